@@ -1,3 +1,4 @@
+import math
 import numpy as np
 
 class L2_boost():
@@ -16,6 +17,13 @@ class L2_boost():
         included to compute theoretical quantities such as the bias and the mse
         alongside the boosting procedure.
 
+    dtype: data-type, default = np.float64
+        Floating point type in which the design matrix, the data and the
+        vectors of the boosting procedure are stored. Single precision halves
+        the memory traffic for large problems. The sums of squares behind
+        residuals, bias2, stoch_error and mse are accumulated in double
+        precision, their accuracy is limited by the stored vectors.
+
     Attributes
     ----------
     sample_size: int
@@ -33,7 +41,8 @@ class L2_boost():
 
     residuals: array
         Lists the sequence of the residual mean of squares betwean the data and
-        the boosting estimator.
+        the boosting estimator. Like bias2, stoch_error and mse, it is a
+        read-only property.
 
     bias2: array
         Only exists if true_signal was given. Lists the values of the squared
@@ -49,47 +58,93 @@ class L2_boost():
         current boosting iteration.
     """
 
-    def __init__(self, input_matrix, output_variable, true_signal = None):
-        self.input_matrix    = input_matrix
-        self.output_variable = output_variable
+    def __init__(self, input_matrix, output_variable, true_signal = None,
+                 dtype = np.float64):
+        self.input_matrix    = np.asarray(input_matrix, dtype = dtype)
+        self.output_variable = np.asarray(output_variable, dtype = dtype)
         self.true_signal     = true_signal
+        if self.true_signal is not None:
+            self.true_signal = np.asarray(true_signal, dtype = dtype)
 
         # Parameters of the model
         self.sample_size = np.shape(input_matrix)[0]
         self.para_size   = np.shape(input_matrix)[1]
 
+        # Column norms of the design matrix, which are fixed across iterations
+        self.__column_norms = np.sqrt(np.einsum('ij,ij->j', self.input_matrix,
+                                                self.input_matrix) / \
+                                      self.sample_size)
+
         # Estimation quantities
         self.iter               = 0
+        self.__terminated        = False
         self.selected_components = np.array([])
         self.orth_directions     = []
-        self.coefficients       = np.zeros(self.para_size)
-        self.boost_estimate      = np.zeros(self.sample_size)
+        self.coefficients       = np.zeros(self.para_size, dtype = dtype)
+        self.boost_estimate      = np.zeros(self.sample_size, dtype = dtype)
 
-        # Residual quantities
-        self.__residual_vector = output_variable
-        self.residuals        = np.array([np.mean(self.__residual_vector**2)])
+        # Residual quantities, updated in place with the help of a scratch
+        # vector for the intermediate products
+        self.__residual_vector = np.array(self.output_variable)
+        self.__scratch_vector  = np.empty(self.sample_size, dtype = dtype)
+
+        # Sequences of residuals, bias2, stoch_error and mse are collected in
+        # lists. The algorithm reads the lists directly, the arrays behind the
+        # public attributes are only built when they are accessed
+        self.__history        = {"residuals": [self.__mean_squares(
+                                                   self.__residual_vector)]}
+        self.__history_arrays = {}
 
         if self.true_signal is not None:
-            self.__error_vector      = self.output_variable - self.true_signal
-            self.__bias2_vector      = self.true_signal
-            self.__stoch_error_vector = np.zeros(self.sample_size)
+            self.__bias2_vector      = np.array(self.true_signal)
+            self.__stoch_error_vector = np.zeros(self.sample_size, dtype = dtype)
+
+            self.__history["bias2"]      = [self.__mean_squares(
+                                               self.__bias2_vector)]
+            self.__history["stoch_error"] = [0.0]
+            self.__history["mse"]        = [self.__mean_squares(
+                                               self.true_signal)]
 
-            self.bias2      = np.array([np.mean(self.__bias2_vector**2)])
-            self.stoch_error = np.array([0])
-            self.mse        = np.array([np.mean(self.true_signal**2)])
+    @property
+    def residuals(self):
+        """Sequence of the residual mean of squares, read-only"""
+        return self.__get_history("residuals")
+
+    @property
+    def bias2(self):
+        """Sequence of the squared bias, read-only"""
+        return self.__get_history("bias2")
+
+    @property
+    def stoch_error(self):
+        """Sequence of the stochastic error, read-only"""
+        return self.__get_history("stoch_error")
+
+    @property
+    def mse(self):
+        """Sequence of the mean squared error, read-only"""
+        return self.__get_history("mse")
 
     def boost(self, iter_num = 1):
-        """Performs iter_num iterations of the orthogonal boosting algorithm"""
+        """Performs iter_num iterations of the orthogonal boosting algorithm
+
+            Remaining iterations are skipped once the algorithm has terminated
+            because a component was selected repeatedly.
+        """
         for index in range(iter_num):
+            if self.__terminated:
+                break
             self.__boost_one_iteration()
 
     def boost_to_early_stop(self, crit, max_iter):
         """Early stopping for the boosting procedure
 
-            Procedure is stopped when the residuals go below crit or iteration
-            max_iter is reached.
+            Procedure is stopped when the residuals go below crit, iteration
+            max_iter is reached or the algorithm has terminated.
         """
-        while self.residuals[self.iter] > crit and self.iter <= max_iter:
+        residuals = self.__history["residuals"]
+        while residuals[self.iter] > crit and self.iter <= max_iter and \
+              not self.__terminated:
             self.__boost_one_iteration()
 
     def boost_to_balanced_oracle(self):
@@ -101,24 +156,30 @@ class L2_boost():
         if self.true_signal is None:
             return "This method is only available when the true signal is known"
         else:
-            while self.bias2[self.iter] > self.stoch_error[self.iter]:
+            bias2       = self.__history["bias2"]
+            stoch_error = self.__history["stoch_error"]
+            while bias2[self.iter] > stoch_error[self.iter] and \
+                  not self.__terminated:
                 self.__boost_one_iteration()
 
     def predict(self, input_variable):
         """Predicts the output variable based on the current boosting estimate"""
+        input_variable = np.asarray(input_variable)
+        if np.shape(input_variable)[-1] != self.para_size:
+            raise ValueError("input_variable must have para_size = "
+                             f"{self.para_size} entries along its last axis")
         return np.dot(input_variable, self.coefficients)
 
     def __boost_one_iteration(self):
         """Performs one iteration of the orthogonal boosting algorithm"""
         # Compute weak learner index and check for repetition
         weak_learner_index            = self.__compute_weak_learner_index()
-        component_selected_repeatedly = False
-        for iter_num in range(self.iter):
-            if weak_learner_index == self.selected_components[iter_num]:
-                component_selected_repeatedly = True
+        component_selected_repeatedly = np.any(self.selected_components ==
+                                               weak_learner_index)
 
         if component_selected_repeatedly:
             print("Algorithm terminated")
+            self.__terminated = True
         else:
             # Update selected variables
             self.selected_components = np.append(self.selected_components,
@@ -130,62 +191,86 @@ class L2_boost():
             coefficient           = np.dot(self.output_variable, weak_learner) / \
                                     self.sample_size
             self.coefficients[weak_learner_index] = coefficient
-            self.boost_estimate    = self.boost_estimate + coefficient * weak_learner
-            self.__residual_vector = self.output_variable - self.boost_estimate
-            new_residuals          = np.mean(self.__residual_vector**2)
-            self.residuals        = np.append(self.residuals, new_residuals)
+            np.multiply(weak_learner, coefficient, out = self.__scratch_vector)
+            self.boost_estimate    += self.__scratch_vector
+            self.__residual_vector -= self.__scratch_vector
+            new_residuals          = self.__mean_squares(self.__residual_vector)
             self.iter             = self.iter + 1
+            self.__history_arrays.clear()
+            self.__history["residuals"].append(new_residuals)
 
             # Update theoretical quantities
             if self.true_signal is not None:
                 self.__update_mse()
-                self.__update_bias2(weak_learner)
-                self.__update_stochastic_error(weak_learner)
+                # The noise is output_variable - true_signal, so its
+                # coefficient follows from the ones already computed
+                signal_coefficient = np.dot(self.true_signal, weak_learner) / \
+                                     self.sample_size
+                self.__update_bias2(weak_learner, signal_coefficient)
+                self.__update_stochastic_error(weak_learner, coefficient -
+                                               signal_coefficient)
 
     def __compute_weak_learner_index(self):
         """ Computes the column index of the design matrix which reduces the
             resiudals the most
         """
-        decreased_residuals = np.zeros(self.para_size)
-        for j in range(self.para_size):
-            direction             = self.input_matrix[:, j]
-            direction_norm         = np.sqrt(np.mean(direction**2))
-            direction             = direction / direction_norm
-            step_size              = np.dot(self.__residual_vector, direction) / \
-                                    self.sample_size
-            decreased_residuals[j] = np.mean((self.__residual_vector -
-                                             step_size * direction)**2)
-        weak_learner_index = np.argmin(decreased_residuals)
+        # For a normalized direction the residuals decrease by the squared
+        # step size, so the largest absolute step size gives the weak learner
+        step_sizes         = np.dot(np.transpose(self.input_matrix),
+                                    self.__residual_vector) / \
+                             (self.sample_size * self.__column_norms)
+        weak_learner_index = np.argmax(np.abs(step_sizes))
         return weak_learner_index
 
     def __update_orth_directions(self, direction):
-        """Updates the list of orthogonal directions"""
-        if self.iter == 0:
-            direction_norm = np.sqrt(np.mean(direction**2))
-            direction     = direction / direction_norm
-        else:
-            for orth_direction in self.orth_directions:
-                dot_product = np.dot(direction, orth_direction) / self.sample_size
-                direction  = direction -  dot_product * orth_direction
-            direction_norm = np.sqrt(np.mean(direction**2))
-            direction     = direction / direction_norm
+        """Updates the list of orthogonal directions
+
+            The direction is projected onto the orthogonal complement of all
+            previous directions one direction at a time, so that no stacked copy
+            of the directions is needed. The projection is applied twice to
+            keep the directions orthogonal to working precision.
+        """
+        if self.iter > 0:
+            direction = np.array(direction)
+            for repetition in range(2):
+                for orth_direction in self.orth_directions:
+                    dot_product = np.dot(direction, orth_direction) / \
+                                  self.sample_size
+                    direction  -= dot_product * orth_direction
+        direction_norm = math.sqrt(np.dot(direction, direction) / self.sample_size)
+        direction     = direction / direction_norm
         self.orth_directions.append(direction)
 
     def __update_mse(self):
-        new_mse   = np.mean((self.true_signal - self.boost_estimate)**2)
-        self.mse = np.append(self.mse, new_mse)
-
-    def __update_bias2(self, weak_learner):
-        coefficient        = np.dot(self.true_signal, weak_learner) / \
-                             self.sample_size
-        self.__bias2_vector = self.__bias2_vector - coefficient * weak_learner
-        new_bias2           = np.mean(self.__bias2_vector**2)
-        self.bias2         = np.append(self.bias2, new_bias2)
-
-    def __update_stochastic_error(self, weak_learner):
-        coefficient             = np.dot(self.__error_vector, weak_learner) / \
-                                 self.sample_size
-        self.__stoch_error_vector = self.__stoch_error_vector + \
-                                  coefficient * weak_learner
-        new_stoch_error           = np.mean(self.__stoch_error_vector**2)
-        self.stoch_error         = np.append(self.stoch_error, new_stoch_error)
+        np.subtract(self.true_signal, self.boost_estimate,
+                    out = self.__scratch_vector)
+        new_mse = self.__mean_squares(self.__scratch_vector)
+        self.__history["mse"].append(new_mse)
+
+    def __update_bias2(self, weak_learner, coefficient):
+        np.multiply(weak_learner, coefficient, out = self.__scratch_vector)
+        self.__bias2_vector -= self.__scratch_vector
+        new_bias2           = self.__mean_squares(self.__bias2_vector)
+        self.__history["bias2"].append(new_bias2)
+
+    def __update_stochastic_error(self, weak_learner, coefficient):
+        np.multiply(weak_learner, coefficient, out = self.__scratch_vector)
+        self.__stoch_error_vector += self.__scratch_vector
+        new_stoch_error           = self.__mean_squares(self.__stoch_error_vector)
+        self.__history["stoch_error"].append(new_stoch_error)
+
+    def __mean_squares(self, vector):
+        """Mean of squares of vector, accumulated in double precision"""
+        if vector.dtype == np.float64:
+            return np.dot(vector, vector) / self.sample_size
+        return np.einsum('i,i->', vector, vector, dtype = np.float64) / \
+               self.sample_size
+
+    def __get_history(self, name):
+        """Returns the sequence name as an array, cached until the next iteration"""
+        if name not in self.__history:
+            raise AttributeError(f"'L2_boost' object has no attribute '{name}'")
+        if name not in self.__history_arrays:
+            self.__history_arrays[name] = np.array(self.__history[name],
+                                                   dtype = np.float64)
+        return self.__history_arrays[name]
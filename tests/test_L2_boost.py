@@ -21,37 +21,66 @@ class Test_L2_boost(unittest.TestCase):
         self.alg.boost(self.alg.sample_size + 1)
         self.assertTrue(self.alg.iter < self.alg.sample_size + 1)
 
+    def test_termination_of_early_stopping(self):
+        self.alg = L2_boost(self.X, self.Y)
+        self.alg.boost_to_early_stop(crit = -1, max_iter = 2 * self.alg.sample_size)
+        self.assertTrue(self.alg.iter <= self.alg.sample_size)
+
     def test_orthonormalization(self):
         self.alg = L2_boost(self.X, self.Y)
         self.alg.boost(self.alg.sample_size)
-        for m in range(self.alg.iter):
-            direction_m = self.alg.orth_directions[m]
-            deviation_vector = np.zeros(self.alg.sample_size)
-            for j in range(self.alg.iter):
-                direction_j = self.alg.orth_directions[j]
-                if j == m:
-                    deviation_vector[j] = 1 - np.mean(direction_j**2)
-                else:
-                    deviation_vector[j] = np.dot(direction_m, direction_j) / self.alg.sample_size
-            condition_vector = ( np.absolute(deviation_vector) > self.tol )
-            number_of_deviations_larger_tol = np.sum(condition_vector)
-            self.assertTrue(number_of_deviations_larger_tol == 0)
+        orth_basis       = np.array(self.alg.orth_directions)
+        gram_matrix      = np.dot(orth_basis, np.transpose(orth_basis)) / self.alg.sample_size
+        deviation_matrix = np.identity(self.alg.iter) - gram_matrix
+        self.assertTrue(np.all(np.absolute(deviation_matrix) <= self.tol))
+
+    def test_prediction(self):
+        self.alg = L2_boost(self.X, self.Y)
+        self.assertTrue(np.all(self.alg.predict(self.X) == 0))
+        self.alg.boost(2)
+        deviation_vector = np.abs(self.alg.predict(self.X) - np.dot(self.X, self.alg.coefficients))
+        self.assertTrue(np.all(deviation_vector < self.tol))
+        deviation = np.abs(self.alg.predict(self.X[0, :]) - np.dot(self.X[0, :], self.alg.coefficients))
+        self.assertTrue(deviation < self.tol)
+        with self.assertRaises(ValueError):
+            self.alg.predict(self.X[:, 1:])
+
+    def test_input_data_is_not_modified(self):
+        Y_copy = np.copy(self.Y)
+        f_copy = np.copy(self.f)
+        self.alg = L2_boost(self.X, self.Y, true_signal = self.f)
+        self.alg.boost(self.alg.sample_size)
+        self.assertTrue(np.array_equal(self.Y, Y_copy))
+        self.assertTrue(np.array_equal(self.f, f_copy))
+
+    def test_single_precision(self):
+        self.alg = L2_boost(self.X, self.Y, true_signal = self.f, dtype = np.float32)
+        self.alg.boost(self.alg.sample_size)
+        self.assertTrue(self.alg.boost_estimate.dtype == np.float32)
+        self.assertTrue(self.alg.residuals.dtype == np.float64)
+        self.assertTrue(self.alg.mse.dtype == np.float64)
+        alg_double = L2_boost(self.X, self.Y, true_signal = self.f)
+        alg_double.boost(alg_double.sample_size)
+        deviation_residuals = np.abs(self.alg.residuals - alg_double.residuals)
+        deviation_mse       = np.abs(self.alg.mse - alg_double.mse)
+        self.assertTrue(np.all(deviation_residuals < 10**(-4) * np.max(alg_double.residuals)))
+        self.assertTrue(np.all(deviation_mse < 10**(-4) * np.max(alg_double.mse)))
 
     def test_monotonicity_of_bias_and_variance(self):
         self.alg = L2_boost(self.X, self.Y, true_signal = self.f)
         self.alg.boost(self.sample_size)
-        for m in range((self.alg.iter - 1)):
-            if self.alg.bias2[m] >= self.tol:
-                self.assertTrue(self.alg.bias2[m] >= self.alg.bias2[(m + 1)])
-            self.assertTrue(self.alg.stoch_error[m] <= self.alg.stoch_error[(m + 1)])
+        bias2_above_tol = self.alg.bias2[:(self.alg.iter - 1)] >= self.tol
+        bias2_increments = np.diff(self.alg.bias2[:self.alg.iter])
+        stoch_error_increments = np.diff(self.alg.stoch_error[:self.alg.iter])
+        self.assertTrue(np.all(bias2_increments[bias2_above_tol] <= 0))
+        self.assertTrue(np.all(stoch_error_increments >= 0))
 
     def test_consistency_of_bias_variance_computation(self):
         self.alg = L2_boost(self.X, self.Y, true_signal = self.f)
         self.alg.boost(self.alg.sample_size)
         alternative_computation_mse = self.alg.bias2 + self.alg.stoch_error
         deviation_vector = np.abs(alternative_computation_mse - self.alg.mse)
-        for m in range(self.alg.iter):
-            self.assertTrue(deviation_vector[m] < self.tol)
+        self.assertTrue(np.all(deviation_vector[:self.alg.iter] < self.tol))
 
     def test_limit_of_the_stochastic_error(self):
         self.alg = L2_boost(self.X, self.Y, true_signal = self.f)